@@ -14,30 +14,77 @@ python scripts/Enrich_Meta_Gpt.py --brick chembl --overwrite
 
 # all bricks, fill only missing fields
 python scripts/Enrich_Meta_Gpt.py --all
+
+# ignore the on-disk HTTP cache (.cache/http, 24 h) and re-scrape
+python scripts/Enrich_Meta_Gpt.py --all --refresh
+
+# also reuse `transformations` from near-duplicate prompts (cosine > 0.92)
+# for bricks that are missing nothing else
+python scripts/Enrich_Meta_Gpt.py --all --semantic-cache
+
+# nightly refresh: all prompts in one OpenAI Batch API job (50 % cheaper)
+python scripts/Enrich_Meta_Gpt.py --all --batch
+
+Bricks are processed concurrently (status scrape + GPT call overlap);
+at most CONCURRENCY bricks are in flight at any time.
 """
 
 from __future__ import annotations
 
-import argparse, os, re
+import argparse, asyncio, hashlib, json, os, re, time
 from pathlib import Path
 from types import SimpleNamespace
 
-import yaml, requests, openai, biobricks as bb
+import aiohttp, yaml, openai, numpy as np, biobricks as bb
 from bs4 import BeautifulSoup
 from dotenv import load_dotenv
 
+try:                                     # libyaml-backed; same safety level
+    from yaml import CSafeLoader as _Loader, CSafeDumper as _Dumper
+except ImportError:
+    from yaml import SafeLoader as _Loader, SafeDumper as _Dumper
+
 # ───────────────────────── env / constants ─────────────────────────
 load_dotenv()
 openai.api_key = os.getenv("OPENAI_API_KEY")
+aclient = openai.AsyncOpenAI() if openai.api_key else None
 
 BRICKS_DIR = Path("brick_repos")
 MARK = "<!-- AUTO-GENERATED-README-START -->"
+CONCURRENCY = 20                         # max bricks in flight at once
+
+CACHE_DIR = Path(".cache")
+HTTP_CACHE_DIR = CACHE_DIR / "http"
+HTTP_CACHE_TTL = 24 * 3600               # seconds
+REFRESH = False                          # --refresh: bypass the HTTP cache
+GPT_CACHE_DIR = CACHE_DIR / "gpt"        # parsed GPT answers, keyed by prompt
+GPT_MODEL = "gpt-4o-mini"
+EMBED_MODEL = "text-embedding-3-small"
+EMBED_MAX_CHARS = 24_000                 # stay under the embedding token limit
+SEMANTIC_CACHE_P = CACHE_DIR / "semantic.npz"
+SEMANTIC_THRESHOLD = 0.92                # min cosine similarity for a hit
+SEMANTIC: "SemanticCache | None" = None  # set by --semantic-cache
+# a semantic hit is usually *another* brick, so only keys describing the
+# pipeline (not the dataset) may be taken from it; title, description,
+# source, license, tags and assets are always asked about this brick
+SEMANTIC_KEYS = ("transformations",)
+BATCH_FILE = CACHE_DIR / "batch.jsonl"   # --batch request upload
+BATCH_POLL_S = 60                        # seconds between batch status polls
 
 EXT2FMT = dict(
     parquet="Parquet", csv="CSV", tsv="TSV",
     json="JSON", h5="HDF5", hdf5="HDF5",
 )
 
+# "<file>.<ext>   12.3 MB" rows on the status page
+ASSET_RX = re.compile(
+    r"(\S+\.(?:parquet|csv|tsv|json|sqlite|txt|h5))\s+(\d+(?:\.\d+)?\s*[KMG]B)",
+    re.I,
+)
+
+SKIP_DIRS = {".git", ".dvc", "node_modules", "__pycache__"}
+DISK_ASSET_LIMIT = 20                    # same cap as auto_meta.detect_assets
+
 META_TEMPLATE = dict(
     title="",
     description="",
@@ -48,24 +95,49 @@ META_TEMPLATE = dict(
     transformations="",
 )
 
+# ───────────────────────── HTTP cache ─────────────────────────
+def http_cache_path(url: str) -> Path:
+    return HTTP_CACHE_DIR / f"{hashlib.sha1(url.encode()).hexdigest()}.json"
+
+def http_cache_get(url: str) -> str | None:
+    """Cached body for *url*, or None if missing / stale / --refresh."""
+    if REFRESH:
+        return None
+    p = http_cache_path(url)
+    try:
+        if time.time() - p.stat().st_mtime > HTTP_CACHE_TTL:
+            return None
+        return json.loads(p.read_text(encoding="utf-8"))["body"]
+    except (OSError, ValueError, KeyError):
+        return None
+
+def http_cache_put(url: str, body: str) -> None:
+    HTTP_CACHE_DIR.mkdir(parents=True, exist_ok=True)
+    http_cache_path(url).write_text(json.dumps({"url": url, "body": body}),
+                                    encoding="utf-8")
+
 # ───────────────────────── helpers ─────────────────────────
 def extract_manual_section(path: Path) -> str:
     if not path.exists():
         return ""
     return path.read_text(encoding="utf-8").split(MARK, 1)[0].strip()
 
-def scrape_status(brick: str) -> str:
+async def scrape_status(session: aiohttp.ClientSession, brick: str) -> str:
     url = f"https://status.biobricks.ai/brick/{brick}"
-    try:
-        return BeautifulSoup(requests.get(url, timeout=10).text,
-                             "html.parser").get_text(" ", strip=True)
-    except Exception:
-        return ""
+    html = http_cache_get(url)
+    if html is None:
+        try:
+            async with session.get(url) as rsp:
+                html = await rsp.text()
+                if rsp.status == 200:
+                    http_cache_put(url, html)
+        except Exception:
+            return ""
+    return BeautifulSoup(html, "html.parser").get_text(" ", strip=True)
 
 def assets_from_status(text: str) -> list[dict]:
     out = []
-    rx = r"(\S+\.(?:parquet|csv|tsv|json|sqlite|txt|h5))\s+(\d+(?:\.\d+)?\s*[KMG]B)"
-    for fn, size in re.findall(rx, text, flags=re.I):
+    for fn, size in ASSET_RX.findall(text):
         out.append(dict(file=fn,
                         format=fn.split(".")[-1].upper(),
                         description=f"Auto-detected file ({size.strip()})"))
@@ -89,77 +161,309 @@ def assets_from_bb(brick: str) -> list[dict]:
 def assets_from_disk(brick: str) -> list[dict]:
     """
     Recursively walk *any* directory under brick_repos/<brick>/ and
-    collect every file with a known data-extension.  The previous
-    version stopped at brick/ ; this one goes as deep as needed.
+    collect files with a known data-extension (at most DISK_ASSET_LIMIT).
+    VCS / cache directories are pruned before descending, so .git/objects
+    and friends are never stat-ed.
     """
-    root = BRICKS_DIR / brick       # start at the brick root
-    res  = []
-    for p in root.rglob("*.*"):      # depth-first search
-        if p.suffix.lstrip(".").lower() in EXT2FMT:
-            res.append(
-                dict(
-                    file=p.name,
-                    format=EXT2FMT[p.suffix.lstrip('.').lower()],
-                    description="file present in repo",
-                )
-            )
+    res: list[dict] = []
+    stack = [str(BRICKS_DIR / brick)]          # iterative depth-first search
+    while stack:
+        try:
+            it = os.scandir(stack.pop())
+        except OSError:
+            continue
+        with it:
+            for entry in it:
+                if entry.is_dir(follow_symlinks=False):
+                    if entry.name not in SKIP_DIRS:
+                        stack.append(entry.path)
+                    continue
+                _, dot, ext = entry.name.rpartition(".")
+                ext = ext.lower()
+                if dot and ext in EXT2FMT:
+                    res.append(dict(file=entry.name, format=EXT2FMT[ext],
+                                    description="file present in repo"))
+                    if len(res) >= DISK_ASSET_LIMIT:
+                        return res
     return res
 
-def merge_assets(*sources: list[dict]) -> list[dict]:
-    seen, merged = set(), []
+def merge_assets(*sources: list[dict], sort: bool = False) -> list[dict]:
+    """
+    First occurrence of each file wins, in source order (single pass,
+    dict-keyed).  *sort* orders the result by file name.
+    """
+    merged: dict[str, dict] = {}
     for src in sources:
         for d in src:
-            if d["file"] in seen:
-                continue
-            seen.add(d["file"])
-            merged.append(d)
-    return sorted(merged, key=lambda x: x["file"])
+            if isinstance(d, dict) and d.get("file"):
+                merged.setdefault(d["file"], d)
+    res = list(merged.values())
+    return sorted(res, key=lambda x: x["file"]) if sort else res
 
-# ───────────────────────── GPT excerpt (unchanged) ────────────
-def gpt_extract_meta(readme: str, status: str) -> dict:
-    if openai.api_key is None:
-        return {}
+# ───────────────────────── GPT excerpt ────────────────────────
+def gpt_cache_key(model: str, messages: list[dict],
+                  temperature: float, max_tokens: int) -> str:
+    """Stable hash of every request field that shapes the completion."""
+    blob = json.dumps(dict(model=model, messages=messages,
+                           temperature=temperature, max_tokens=max_tokens),
+                      sort_keys=True)
+    return hashlib.sha256(blob.encode()).hexdigest()
+
+class SemanticCache:
+    """
+    Nearest-neighbour cache of GPT answers keyed by prompt embedding.
+    A lookup hits when the best cosine similarity is ≥ *threshold*.  The
+    neighbour is usually another brick, so only its SEMANTIC_KEYS are
+    stored and returned.  Persisted as (vecs, answers) in an .npz file.
+    """
+
+    def __init__(self, path: Path, threshold: float = SEMANTIC_THRESHOLD):
+        self.path, self.threshold = path, threshold
+        self.vecs = np.empty((0, 0), dtype=np.float32)   # unit-norm rows
+        self.answers: list[str] = []                       # raw YAML
+        self.dirty = False
+        if path.exists():
+            with np.load(path) as npz:
+                self.vecs = npz["vecs"]
+                self.answers = [str(a) for a in npz["answers"]]
+
+    def lookup(self, vec: np.ndarray) -> dict | None:
+        if not self.answers:
+            return None
+        sims = self.vecs @ vec
+        best = int(sims.argmax())
+        if sims[best] < self.threshold:
+            return None
+        data = yaml.load(self.answers[best], Loader=_Loader) or {}
+        # older .npz files hold whole answers: filter on the way out too
+        return {k: data[k] for k in SEMANTIC_KEYS if data.get(k)} or None
+
+    def add(self, vec: np.ndarray, data: dict) -> None:
+        data = {k: data[k] for k in SEMANTIC_KEYS if data.get(k)}
+        if not data:
+            return
+        self.vecs = (np.vstack([self.vecs, vec]) if self.answers
+                     else vec[np.newaxis, :])
+        self.answers.append(yaml.dump(data, Dumper=_Dumper, sort_keys=False))
+        self.dirty = True
+
+    def save(self) -> None:
+        if not self.dirty:
+            return
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        np.savez(self.path, vecs=self.vecs, answers=np.array(self.answers))
+        self.dirty = False
+
+async def embed(text: str) -> np.ndarray | None:
+    try:
+        rsp = await aclient.embeddings.create(model=EMBED_MODEL,
+                                              input=text[:EMBED_MAX_CHARS])
+    except Exception:
+        return None
+    vec = np.asarray(rsp.data[0].embedding, dtype=np.float32)
+    return vec / np.linalg.norm(vec)
+
+def gpt_request(readme: str, status: str) -> dict:
+    """Chat-completions body for one brick (shared by sync + batch modes)."""
     prompt = (
         "Extract dataset metadata in YAML with keys:\n"
         "title, description, source(list), license, tags(list), "
         "assets(list of {file,format,description}), transformations.\n"
-        "Return RAW YAML only.\n\n"
+        "Return RAW YAML only and end the document with a line containing "
+        "just `...` (the YAML end marker).\n\n"
         f"README:\n{readme}\n\nSTATUS:\n{status}"
     )
-    rsp = openai.ChatCompletion.create(
-        model="gpt-4o-mini",
-        messages=[{"role": "user", "content": prompt}],
-        temperature=0.2,
-        max_tokens=300,
-    )
+    return dict(model=GPT_MODEL,
+                messages=[{"role": "user", "content": prompt}],
+                temperature=0.2, max_tokens=300)
+
+def gpt_cache_path(req: dict) -> Path | None:
+    # identical prompt → identical answer (low temperature): reuse it
+    if req["temperature"] > 0.2:
+        return None
+    return GPT_CACHE_DIR / (gpt_cache_key(**req) + ".yaml")
+
+def gpt_cache_load(cache_p: Path | None) -> dict | None:
+    if cache_p is None or not cache_p.exists():
+        return None
+    data = yaml.load(cache_p.read_text(encoding="utf-8"), Loader=_Loader)
+    return data or {}
+
+def gpt_parse(content: str | None, cache_p: Path | None) -> dict:
+    """YAML answer → dict; well-formed answers are written to the cache."""
     try:
-        data = yaml.safe_load(rsp.choices[0].message.content)
-        return data if isinstance(data, dict) else {}
+        data = yaml.load(content or "", Loader=_Loader)
     except Exception:
         return {}
+    if not isinstance(data, dict):
+        return {}
+    if cache_p is not None:
+        GPT_CACHE_DIR.mkdir(parents=True, exist_ok=True)
+        cache_p.write_text(yaml.dump(data, Dumper=_Dumper, sort_keys=False),
+                           encoding="utf-8")
+    return data
 
-def is_stub(v):
-    if isinstance(v, str):
-        return v.strip().lower().startswith("todo") or v.strip() == ""
-    if isinstance(v, list):
-        return all(is_stub(x) for x in v)
-    if isinstance(v, dict):
-        return all(is_stub(x) for x in v.values())
+TOP_KEY_RX = re.compile(r"[A-Za-z_][\w-]*\s*:(?:\s|$)")
+DOC_END = "..."                          # YAML end marker the prompt asks for
+
+def complete_prefix(text: str) -> str | None:
+    """
+    The prefix of a streamed answer that ends just before its newest
+    complete line, if that line closes the document (`...`) or starts a
+    new top-level key, and the prefix already holds a non-empty value for
+    every META_TEMPLATE key.  A value is only known to be finished at such
+    a line: plain scalars may continue on following indented lines.
+    """
+    body = text[:text.rfind("\n")]
+    cut = body.rfind("\n")
+    if cut < 0:
+        return None
+    last = body[cut + 1:]
+    if last.rstrip() != DOC_END and not TOP_KEY_RX.match(last):
+        return None
+    prefix = body[:cut]
+    try:
+        data = yaml.load(prefix, Loader=_Loader)
+    except yaml.YAMLError:
+        return None
+    if not isinstance(data, dict):
+        return None
+    if any(data.get(k) in (None, "") for k in META_TEMPLATE):
+        return None
+    return prefix
+
+async def gpt_stream(req: dict) -> str:
+    """
+    Stream the completion and stop reading at the `...` end marker (or an
+    extra top-level key) once every key is covered, so a closing fence or
+    trailing commentary is never waited for; otherwise return the full
+    answer.
+    """
+    stream = await aclient.chat.completions.create(**req, stream=True)
+    buf = ""
+    try:
+        async for chunk in stream:
+            if not chunk.choices:
+                continue
+            delta = chunk.choices[0].delta.content or ""
+            buf += delta
+            if "\n" in delta and (body := complete_prefix(buf)) is not None:
+                return body
+    finally:
+        await stream.close()
+    return buf
+
+async def gpt_extract_meta(readme: str, status: str,
+                           needed: list[str] | None = None) -> dict:
+    """
+    GPT meta for one brick.  *needed* lists the keys the caller will
+    actually use; a semantic hit is returned only if it covers them all.
+    """
+    req = gpt_request(readme, status)
+    cache_p = gpt_cache_path(req)
+    if (cached := gpt_cache_load(cache_p)) is not None:
+        return cached
+
+    if aclient is None:
+        return {}
+
+    prompt = req["messages"][0]["content"]
+    vec = None
+    if SEMANTIC is not None and (vec := await embed(prompt)) is not None:
+        hit = SEMANTIC.lookup(vec)
+        if hit is not None and needed is not None and set(needed) <= hit.keys():
+            return hit
+
+    data = gpt_parse(await gpt_stream(req), cache_p)
+    if data and vec is not None:
+        SEMANTIC.add(vec, data)
+    return data
+
+async def gpt_batch_extract(inputs: dict[str, tuple[str, str]]) -> dict[str, dict]:
+    """
+    --batch mode: send every uncached prompt as one Batch API job
+    (half price, completes within 24 h) and wait for it to finish.
+    *inputs* maps brick → (readme, status); returns brick → GPT meta.
+    """
+    out: dict[str, dict] = {}
+    pending: dict[str, Path | None] = {}
+    lines = []
+    for brick, (readme, status) in inputs.items():
+        req = gpt_request(readme, status)
+        cache_p = gpt_cache_path(req)
+        if (cached := gpt_cache_load(cache_p)) is not None:
+            out[brick] = cached
+            continue
+        pending[brick] = cache_p
+        lines.append(json.dumps({"custom_id": brick, "method": "POST",
+                                 "url": "/v1/chat/completions", "body": req}))
+    if not pending or aclient is None:
+        return out
+
+    BATCH_FILE.parent.mkdir(parents=True, exist_ok=True)
+    BATCH_FILE.write_text("\n".join(lines) + "\n", encoding="utf-8")
+    with BATCH_FILE.open("rb") as fh:
+        upload = await aclient.files.create(file=fh, purpose="batch")
+    job = await aclient.batches.create(input_file_id=upload.id,
+                                       endpoint="/v1/chat/completions",
+                                       completion_window="24h")
+    print(f"⏳ batch {job.id}: {len(pending)} prompts submitted")
+    while job.status not in ("completed", "failed", "expired", "cancelled"):
+        await asyncio.sleep(BATCH_POLL_S)
+        job = await aclient.batches.retrieve(job.id)
+    print(f"⏹ batch {job.id}: {job.status}")
+    if not job.output_file_id:
+        return out
+
+    results = await aclient.files.content(job.output_file_id)
+    for line in results.text.splitlines():
+        row = json.loads(line)
+        brick = row["custom_id"]
+        rsp = row.get("response") or {}
+        if brick not in pending or rsp.get("status_code") != 200:
+            continue
+        content = rsp["body"]["choices"][0]["message"]["content"]
+        out[brick] = gpt_parse(content, pending[brick])
+    return out
+
+def _str_stub(v: str) -> bool:
+    v = v.strip()
+    return not v or v.lower().startswith("todo")
+
+# type(v) → test; one dict lookup instead of an isinstance() ladder
+_STUB_DISPATCH = {
+    str:  _str_stub,
+    list: lambda v: not v or all(is_stub(x) for x in v),
+    dict: lambda v: not v or all(is_stub(x) for x in v.values()),
+}
+
+def _falsy(v) -> bool:
     return not v
 
+def is_stub(v):
+    return _STUB_DISPATCH.get(type(v), _falsy)(v)
+
 # ───────────────────────── main enrichment ─────────────────────
-def enrich(brick: str, overwrite: bool = False):
-    path = BRICKS_DIR/brick
-    meta_p = path/"meta.yaml"
-    readme_p = path/"README.md"
+async def collect_inputs(brick: str, session: aiohttp.ClientSession,
+                         sem: asyncio.Semaphore) -> tuple[str, str]:
+    """Manual README section + scraped status text for *brick*."""
+    manual = extract_manual_section(BRICKS_DIR/brick/"README.md")
+    async with sem:                          # cap concurrent HTTP calls
+        status_txt = await scrape_status(session, brick)
+    return manual, status_txt
 
-    manual = extract_manual_section(readme_p)
-    status_txt = scrape_status(brick)
-    gpt_meta = gpt_extract_meta(manual, status_txt)
+def load_meta(brick: str) -> dict:
+    """Existing brick_repos/<brick>/meta.yaml, or {} if there is none."""
+    meta_p = BRICKS_DIR/brick/"meta.yaml"
+    meta = yaml.load(meta_p.read_text(), Loader=_Loader) if meta_p.exists() else {}
+    return meta or {}
 
-    # existing meta (if any)
-    meta = yaml.safe_load(meta_p.read_text()) if meta_p.exists() else {}
-    meta = meta or {}
+def missing_keys(meta: dict) -> list[str]:
+    return [k for k in META_TEMPLATE if not meta.get(k) or is_stub(meta[k])]
+
+def apply_meta(brick: str, meta: dict, status_txt: str, gpt_meta: dict,
+               overwrite: bool = False):
+    meta_p = BRICKS_DIR/brick/"meta.yaml"
 
     # assemble assets
     if overwrite or not meta.get("assets") or is_stub(meta["assets"]):
@@ -168,6 +472,7 @@ def enrich(brick: str, overwrite: bool = False):
             assets_from_disk(brick),
             gpt_meta.get("assets", []),
             assets_from_status(status_txt),
+            sort=True,                       # stable meta.yaml diffs
         )
 
     # other keys
@@ -181,12 +486,74 @@ def enrich(brick: str, overwrite: bool = False):
     if "transformations" not in meta or is_stub(meta["transformations"]):
         meta["transformations"] = "None — preserved as-is"
 
-    meta_p.write_text(yaml.safe_dump(meta, sort_keys=False))
+    meta_p.write_text(yaml.dump(meta, Dumper=_Dumper, sort_keys=False))
     print(f"✓ {brick}")
 
+async def enrich(brick: str, meta: dict, session: aiohttp.ClientSession,
+                 sem: asyncio.Semaphore, overwrite: bool = False):
+    manual, status_txt = await collect_inputs(brick, session, sem)
+    async with sem:                          # cap concurrent GPT calls
+        needed = list(META_TEMPLATE) if overwrite else missing_keys(meta)
+        gpt_meta = await gpt_extract_meta(manual, status_txt, needed)
+    apply_meta(brick, meta, status_txt, gpt_meta, overwrite=overwrite)
+
+def report_failures(bricks: list[str], results: list) -> None:
+    for b, res in zip(bricks, results):
+        if isinstance(res, Exception):
+            print(f"✗ {b}: {res}")
+
+async def enrich_all(bricks: list[str], overwrite: bool = False,
+                     batch: bool = False):
+    # check before running: complete meta.yaml files need no HTTP/GPT at all
+    metas: dict[str, dict] = {}
+    for b in bricks:
+        try:
+            meta = load_meta(b)
+        except Exception as e:
+            print(f"✗ {b}: {e}")
+            continue
+        if overwrite or missing_keys(meta):
+            metas[b] = meta
+        else:
+            print(f"⏭ {b}: nothing to enrich – skipped")
+    bricks = list(metas)
+
+    sem = asyncio.Semaphore(CONCURRENCY)
+    timeout = aiohttp.ClientTimeout(total=10)
+    conn = aiohttp.TCPConnector(limit=CONCURRENCY)   # pooled, keep-alive
+    async with aiohttp.ClientSession(
+        connector=conn, timeout=timeout,
+        headers={"User-Agent": "brick-orchestration"},
+    ) as session:
+        if not batch:
+            results = await asyncio.gather(
+                *(enrich(b, metas[b], session, sem, overwrite=overwrite)
+                  for b in bricks),
+                return_exceptions=True,
+            )
+            report_failures(bricks, results)
+            return
+        results = await asyncio.gather(
+            *(collect_inputs(b, session, sem) for b in bricks),
+            return_exceptions=True,
+        )
+    report_failures(bricks, results)
+
+    # --batch: one Batch API job for every prompt, then merge/write
+    inputs = {b: res for b, res in zip(bricks, results)
+              if not isinstance(res, Exception)}
+    gpt = await gpt_batch_extract(inputs)
+    for b, (_, status_txt) in inputs.items():
+        try:
+            apply_meta(b, metas[b], status_txt, gpt.get(b, {}),
+                       overwrite=overwrite)
+        except Exception as e:
+            print(f"✗ {b}: {e}")
+
 # ───────────────────────── CLI ─────────────────────────
 # ───────── CLI glue ─────────
 def main():
+    global REFRESH, SEMANTIC
     ap = argparse.ArgumentParser()
     g = ap.add_mutually_exclusive_group(required=True)
     g.add_argument("--brick")                  # e.g. --brick chembl
@@ -195,13 +562,27 @@ def main():
     # 👇 this line must exist, otherwise --overwrite is “unrecognized”
     ap.add_argument("--overwrite", action="store_true",
                     help="replace existing values instead of merging")
+    ap.add_argument("--refresh", action="store_true",
+                    help="ignore the on-disk HTTP cache and fetch fresh data")
+    ap.add_argument("--semantic-cache", action="store_true",
+                    help="reuse GPT answers for near-duplicate prompts")
+    ap.add_argument("--batch", action="store_true",
+                    help="send all GPT prompts as one Batch API job "
+                         "(50%% cheaper, may take hours)")
     
     args = ap.parse_args()
+    REFRESH = args.refresh
+    if args.semantic_cache:
+        SEMANTIC = SemanticCache(SEMANTIC_CACHE_P)
 
     bricks = ([args.brick] if args.brick else
               sorted(p.name for p in BRICKS_DIR.iterdir() if p.is_dir()))
-    for b in bricks:
-        enrich(b, overwrite=args.overwrite)
+    try:
+        asyncio.run(enrich_all(bricks, overwrite=args.overwrite,
+                               batch=args.batch))
+    finally:
+        if SEMANTIC is not None:
+            SEMANTIC.save()
 
 
 if __name__ == "__main__":
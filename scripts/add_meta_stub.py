@@ -4,6 +4,10 @@ Afterwards you can fill in the plain‑language fields.
 """
 import os, subprocess, yaml
 from pathlib import Path
+try:                                     # libyaml-backed; same safety level
+    from yaml import CSafeDumper as _Dumper
+except ImportError:
+    from yaml import SafeDumper as _Dumper
 
 ORG = "biobricks-ai"
 REPO_DIR = Path("brick_repos")          # where repos are cloned
@@ -13,20 +17,26 @@ REPO_DIR = Path("brick_repos")          # where repos are cloned
 import json, shutil, subprocess, sys
 
 def list_bricks():
-    return subprocess.check_output(
-        ["gh", "api",
-         "-H", "Accept: application/vnd.github+json",
-         f"orgs/{ORG}/repos",
-         "--paginate",                 # ← follow all pages
-         "--jq", ".[].name"]
-    ).decode().splitlines()
+    """Yield repo names as `gh` prints them (one page at a time)."""
+    cmd = ["gh", "api",
+           "-H", "Accept: application/vnd.github+json",
+           f"orgs/{ORG}/repos",
+           "--paginate",                 # ← follow all pages
+           "--jq", ".[].name"]
+    with subprocess.Popen(cmd, stdout=subprocess.PIPE, text=True) as proc:
+        for line in proc.stdout:
+            if name := line.strip():
+                yield name
+    if proc.returncode:
+        raise subprocess.CalledProcessError(proc.returncode, cmd)
 
 
-bricks = list_bricks()
-print(f"\n🔎 Found {len(bricks)} brick repos in {ORG}:")
-for name in bricks:
+print(f"\n🔎 Brick repos in {ORG}:")
+bricks = []
+for name in list_bricks():
     print("   •", name)
-print()  # blank line for readability
+    bricks.append(name)
+print(f"   ({len(bricks)} found)\n")
 # -------------------- create stub meta if missing ------------------------ #
 STUB = {
     "brick_name": "",
@@ -49,7 +59,7 @@ STUB = {
     ]
 }
 
-for brick in list_bricks():
+for brick in bricks:
     local = REPO_DIR / brick
     if not local.exists():
         subprocess.run(["git", "clone", f"https://github.com/{ORG}/{brick}.git", local])
@@ -59,5 +69,5 @@ for brick in list_bricks():
     stub = STUB.copy()
     stub["brick_name"] = brick
     with open(meta_path, "w") as f:
-        yaml.safe_dump(stub, f, sort_keys=False)
+        yaml.dump(stub, f, Dumper=_Dumper, sort_keys=False)
     print(f"📝  created stub meta.yaml for {brick}")
@@ -9,15 +9,31 @@ auto_meta_enrich.py  –  generate *and* enrich each brick’s meta.yaml
 Prereqs:
   • export GH_TOKEN=ghp_xxx   # read-access PAT (write if you want auto-push)
   • pip install pyyaml requests cloudscraper
+  • optional: pip install pygit2   # in-process clone/fetch instead of `git`
 Usage:
   python scripts/auto_meta_enrich.py
+  python scripts/auto_meta_enrich.py --refresh   # ignore .cache/http (24 h)
 """
 
 from __future__ import annotations
-import os, re, json, subprocess, requests, yaml, hashlib
+import argparse, copy, os, re, json, subprocess, requests, yaml, hashlib, threading, time
+import cloudscraper
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from typing import Any, Dict
 
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+try:                                     # libyaml-backed; same safety level
+    from yaml import CSafeLoader as _Loader, CSafeDumper as _Dumper
+except ImportError:
+    from yaml import SafeLoader as _Loader, SafeDumper as _Dumper
+try:                                     # libgit2: clone/fetch without fork+exec
+    import pygit2
+except ImportError:
+    pygit2 = None
+
 # --------------------------------------------------------------------- #
 ORG = "biobricks-ai"
 REPO_DIR = Path("brick_repos")
@@ -29,20 +45,103 @@ KEPT = [          # unchanged: your curated repo allow-list
     "iuclid"
 ]
 
+CACHE_DIR = Path(".cache")
+HTTP_CACHE_DIR = CACHE_DIR / "http"
+HTTP_CACHE_TTL = 24 * 3600      # seconds
+REFRESH = False                 # --refresh: bypass the HTTP cache
+GH_CACHE_DIR = CACHE_DIR / "gh"  # GitHub API bodies + ETags
+WORKERS = 8                     # bricks processed in parallel
+
+NEXT_DATA_RX = re.compile(
+    r'__NEXT_DATA__"\s+type="application/json">\s*(.*?)\s*</script>', re.S
+)
+
 HEADERS = {"Authorization": f"Bearer {os.getenv('GH_TOKEN','')}"}
+
+# one pooled session for every GitHub call (keeps TCP/TLS alive between bricks)
+SESSION = requests.Session()
+SESSION.mount("https://", HTTPAdapter(
+    pool_connections=10, pool_maxsize=20,
+    max_retries=Retry(total=3, backoff_factor=0.3,
+                      status_forcelist=[429, 502, 503, 504]),
+))
+SESSION.headers.update({"User-Agent": "brick-orchestration", **HEADERS})
+
+# one Cloudflare-aware session for status.biobricks.ai: the challenge is
+# solved once and its cookies are reused for every later brick
+_SCRAPER = cloudscraper.create_scraper()
 # --------------------------------------------------------------------- #
+# ───────────────────────── on-disk HTTP cache ───────────────────────── #
+def http_cache_path(url: str) -> Path:
+    return HTTP_CACHE_DIR / f"{hashlib.sha1(url.encode()).hexdigest()}.json"
+
+def http_cache_get(url: str) -> str | None:
+    """Cached body for *url*, or None if missing / stale / --refresh."""
+    if REFRESH:
+        return None
+    p = http_cache_path(url)
+    try:
+        if time.time() - p.stat().st_mtime > HTTP_CACHE_TTL:
+            return None
+        return json.loads(p.read_text(encoding="utf-8"))["body"]
+    except (OSError, ValueError, KeyError):
+        return None
+
+def http_cache_put(url: str, body: str) -> None:
+    HTTP_CACHE_DIR.mkdir(parents=True, exist_ok=True)
+    http_cache_path(url).write_text(json.dumps({"url": url, "body": body}),
+                                    encoding="utf-8")
+
 # ───────────────────────── GitHub helpers ───────────────────────────── #
 def gh_api(path: str) -> Dict[str, Any]:
-    r = requests.get(f"https://api.github.com/{path}", headers=HEADERS, timeout=30)
+    """
+    GET api.github.com/<path>, cached as {"etag", "body"} in .cache/gh/.
+    Fresh entries (< HTTP_CACHE_TTL, no --refresh) skip the network;
+    stale ones are revalidated with If-None-Match, and a 304 reply does
+    not count against the GitHub rate limit.
+    """
+    cache_p = GH_CACHE_DIR / (path.strip("/").replace("/", "__") + ".json")
+    try:
+        cached = json.loads(cache_p.read_text(encoding="utf-8"))
+        age = time.time() - cache_p.stat().st_mtime
+    except (OSError, ValueError):
+        cached, age = None, None
+    if cached and not REFRESH and age <= HTTP_CACHE_TTL:
+        return cached["body"]
+
+    headers = {"If-None-Match": cached["etag"]} if cached and cached.get("etag") else {}
+    r = SESSION.get(f"https://api.github.com/{path}", headers=headers, timeout=30)
+    if r.status_code == 304:
+        cache_p.touch()                      # still valid: restart the TTL
+        return cached["body"]
     r.raise_for_status()
-    return r.json()
+    body = r.json()
+    GH_CACHE_DIR.mkdir(parents=True, exist_ok=True)
+    cache_p.write_text(json.dumps({"etag": r.headers.get("ETag"), "body": body}),
+                       encoding="utf-8")
+    return body
 
 def clone_or_pull(name: str) -> Path | None:
     local = REPO_DIR / name
+    url = f"https://github.com/{ORG}/{name}.git"
+    if pygit2 is not None:
+        if not local.exists():
+            try:
+                pygit2.clone_repository(url, str(local))
+            except pygit2.GitError:
+                print(f"   🚫  clone denied for {name}")
+                return None
+        else:
+            repo = pygit2.Repository(str(local))
+            repo.remotes["origin"].fetch()
+            ref = repo.lookup_reference(f"refs/remotes/origin/{repo.head.shorthand}")
+            repo.reset(ref.target, pygit2.GIT_RESET_HARD)
+        return local
+
     if not local.exists():
         try:
             subprocess.run(
-                ["git","clone",f"https://github.com/{ORG}/{name}.git",local],
+                ["git","clone",url,local],
                 check=True, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL
             )
         except subprocess.CalledProcessError:
@@ -53,22 +152,28 @@ def clone_or_pull(name: str) -> Path | None:
     return local
 
 # ─────────────────────── stub-generation bits ───────────────────────── #
+ASSET_EXTS = {"parquet","csv","tsv","json","sqlite","db","sdf","txt"}
+MAX_ASSETS = 20
+
 def detect_assets(repo: Path):
-    exts = {".parquet",".csv",".tsv",".json",".sqlite",".db",".sdf",".txt"}
     brick_dir = repo / "brick"
     assets = []
     if not brick_dir.exists():
         return assets
     for root, _, files in os.walk(brick_dir):
         for f in files:
+            _, dot, ext = f.rpartition(".")
+            if not dot or ext.lower() not in ASSET_EXTS:
+                continue
             p = Path(root)/f
-            if p.suffix.lower() in exts:
-                assets.append({
-                    "file": str(p.relative_to(repo)),
-                    "format": p.suffix.lstrip(".").upper(),
-                    "description": "TODO: describe this file"
-                })
-    return assets[:20]
+            assets.append({
+                "file": str(p.relative_to(repo)),
+                "format": ext.upper(),
+                "description": "TODO: describe this file"
+            })
+            if len(assets) >= MAX_ASSETS:    # stop walking once we have enough
+                return assets
+    return assets
 
 def make_stub(name: str, repo: Path):
     info = gh_api(f"repos/{ORG}/{name}")
@@ -91,12 +196,16 @@ def make_stub(name: str, repo: Path):
 
 # ─────────────────────── enrichment bits ────────────────────────────── #
 def fetch_status_html(brick: str) -> str:
-    import cloudscraper
     url = f"https://status.biobricks.ai/u/biobricks-ai/{brick}"
-    return cloudscraper.create_scraper().get(url, timeout=30).text
+    if (html := http_cache_get(url)) is not None:
+        return html
+    r = _SCRAPER.get(url, timeout=30)
+    if r.ok:
+        http_cache_put(url, r.text)
+    return r.text
 
 def extract_next_data(html: str) -> Dict[str, Any]:
-    m = re.search(r'__NEXT_DATA__"\s+type="application/json">\s*(.*?)\s*</script>', html, re.S)
+    m = NEXT_DATA_RX.search(html)
     if not m:
         raise RuntimeError("no __NEXT_DATA__ found")
     return json.loads(m.group(1))
@@ -105,7 +214,7 @@ def enrich(meta: Dict[str, Any], brick: str) -> Dict[str, Any]:
     try:
         data = extract_next_data(fetch_status_html(brick))["props"]["pageProps"]["brick"]
     except Exception as e:
-        print(f"   ⚠️  enrich failed: {e}")
+        print(f"   ⚠️  {brick}: enrich failed: {e}")
         return meta
 
     if (dt := data.get("dataset_type")):   # dataset_type
@@ -127,42 +236,76 @@ def enrich(meta: Dict[str, Any], brick: str) -> Dict[str, Any]:
     return meta
 
 # ─────────────────────────── main loop ──────────────────────────────── #
-def sha(text: str) -> str:
-    return hashlib.sha1(text.encode()).hexdigest()
+# add + commit + push in one process; exit status says which step failed
+GIT_PUBLISH = (
+    "git add meta.yaml || exit 3; "
+    "git commit -q -m 'chore: enrich meta.yaml' || exit 4; "
+    "git push -q || exit 5"
+)
+
+failed_clone: list[str] = []
+failed_push: list[str] = []
+_lock = threading.Lock()                 # guards the two lists above
+
+def process(repo: str) -> None:
+    """clone → stub/enrich → write → commit → push for one brick."""
+    print(f"→ {repo}")
+    local = clone_or_pull(repo)
+    if local is None:
+        with _lock:
+            failed_clone.append(repo)
+        return
+
+    meta_path = local / "meta.yaml"
+    if meta_path.exists():
+        meta = yaml.load(meta_path.read_text(), Loader=_Loader)
+    else:
+        meta = make_stub(repo, local)
+        print(f"   📝  {repo}: stub meta created")
+
+    before = copy.deepcopy(meta)             # structural compare, no YAML dump
+    meta = enrich(meta, repo)
+
+    if before == meta:
+        print(f"   ⏭️  {repo}: no changes after enrichment")
+        return
+
+    # write, commit, push (each repo has its own working tree → thread-safe)
+    meta_path.write_text(yaml.dump(meta, Dumper=_Dumper, sort_keys=False))
+    rc = subprocess.run(["sh", "-c", GIT_PUBLISH], cwd=local,
+                        capture_output=True).returncode
+    if rc == 0:
+        print(f"   ✅  {repo}: pushed enriched meta.yaml")
+    elif rc == 5:
+        print(f"   🚫  {repo}: push denied (read-only repo)")
+        with _lock:
+            failed_push.append(repo)
+    else:
+        step = {3: "add", 4: "commit"}.get(rc, f"exit {rc}")
+        print(f"   ⚠️  {repo}: git {step} failed")
 
 def main():
+    global REFRESH
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--refresh", action="store_true",
+                    help="ignore the on-disk HTTP cache and fetch fresh data")
+    REFRESH = ap.parse_args().refresh
+
     REPO_DIR.mkdir(exist_ok=True)
-    for repo in KEPT:
-        print(f"\n→ {repo}")
-        local = clone_or_pull(repo)
-        if local is None:
-            continue
-
-        meta_path = local / "meta.yaml"
-        if meta_path.exists():
-            meta = yaml.safe_load(meta_path.read_text())
-        else:
-            meta = make_stub(repo, local)
-            print("   📝  stub meta created")
-
-        before = sha(yaml.safe_dump(meta, sort_keys=False))
-        meta = enrich(meta, repo)
-        after  = sha(yaml.safe_dump(meta, sort_keys=False))
-
-        if before == after:
-            print("   ⏭️  no changes after enrichment")
-            continue
-
-        # write, commit, push
-        meta_path.write_text(yaml.safe_dump(meta, sort_keys=False))
-        subprocess.run(["git","-C",local,"add","meta.yaml"])
-        subprocess.run(["git","-C",local,"commit","-m","chore: enrich meta.yaml"],
-                       check=False, stdout=subprocess.DEVNULL)
-        try:
-            subprocess.run(["git","-C",local,"push"], check=True, stdout=subprocess.DEVNULL)
-            print("   ✅  pushed enriched meta.yaml")
-        except subprocess.CalledProcessError:
-            print("   🚫  push denied (read-only repo)")
+    # git + GitHub API are network-bound: overlap them across bricks.
+    # GitHub rate limiting is handled by SESSION's Retry/backoff.
+    with ThreadPoolExecutor(max_workers=WORKERS) as ex:
+        futures = {ex.submit(process, repo): repo for repo in KEPT}
+    for fut, repo in futures.items():
+        if (exc := fut.exception()) is not None:
+            print(f"   ❌  {repo}: {exc}")
+
+    print(f"\n{len(KEPT)} bricks, {len(failed_clone)} clone denied, "
+          f"{len(failed_push)} push denied")
+    for name in failed_clone:
+        print(f"   clone denied: {name}")
+    for name in failed_push:
+        print(f"   push denied:  {name}")
 
 if __name__ == "__main__":
     main()
@@ -7,38 +7,39 @@ and removing any duplicate generated content.
 """
 
 from __future__ import annotations
-import sys
+import os, sys
 from pathlib import Path
 
 # ────────────────────────────────────────────────────────────────────────────────
 ROOT       = Path(__file__).resolve().parents[1]   # brick-orchestration/
 BRICKS_DIR = ROOT / "brick_repos"
 MARK = "<!-- AUTO‑GENERATED‑README‑START -->"
+MARK_B = MARK.encode("utf-8")
 # ────────────────────────────────────────────────────────────────────────────────
 
 def clean_readme(brick_name: str):
     brick_path = BRICKS_DIR / brick_name
     readme_path = brick_path / "README.md"
 
-    if not readme_path.exists():
+    try:
+        raw = readme_path.read_bytes()
+    except FileNotFoundError:
         print(f"⚠️  {brick_name}: README.md not found – skipped")
         return
 
-    # Read the current content
-    content = readme_path.read_text(encoding="utf-8")
-    
-    # Split on the marker and keep only the manual content
-    parts = content.split(MARK)
-    if len(parts) > 1:
-        # Keep only the manual content
-        cleaned = parts[0].rstrip()
-        readme_path.write_text(cleaned, encoding="utf-8")
-        print(f"✅  {brick_name}: README.md cleaned")
-    else:
+    # Fast path: no marker → nothing to clean, no UTF-8 decode needed
+    if raw.find(MARK_B) == -1:
         print(f"ℹ️  {brick_name}: No marker found – skipped")
+        return
+
+    # Keep only the manual content above the marker
+    cleaned = raw.decode("utf-8").split(MARK, 1)[0].rstrip()
+    readme_path.write_text(cleaned, encoding="utf-8")
+    print(f"✅  {brick_name}: README.md cleaned")
 
 def main():
-    bricks = sorted(p.name for p in BRICKS_DIR.iterdir() if p.is_dir())
+    with os.scandir(BRICKS_DIR) as it:
+        bricks = sorted(e.name for e in it if e.is_dir())
     for b in bricks:
         clean_readme(b)
 
@@ -1,23 +1,56 @@
+import hashlib
+import os
+import jinja2
 import yaml
 from jinja2 import Environment, FileSystemLoader
 from pathlib import Path
+try:                                     # libyaml-backed; same safety level
+    from yaml import CSafeLoader as _Loader
+except ImportError:
+    from yaml import SafeLoader as _Loader
 
 BRICKS_DIR = Path(__file__).parent.parent / "brick_repos"
 TEMPLATE_DIR = Path(__file__).parent.parent / "templates"
 TEMPLATE_FN = "readme_template.j2"
 MARK = "<!-- AUTO‑GENERATED‑README‑START -->"
+MARK_B = MARK.encode("utf-8")
+WRITE_BUFSIZE = 131072                   # one 128 KiB buffered writer per README
+_ASCII_WS = frozenset(b" \t\n\r\x0b\x0c\x1c\x1d\x1e\x1f")   # str.isspace() ∩ ASCII
 
-def load_meta(meta_path):
-    with open(meta_path, "r") as f:
-        return yaml.safe_load(f)
+# compiled once at import, reused for every brick
+_ENV = Environment(loader=FileSystemLoader(TEMPLATE_DIR))
+_TEMPLATE = _ENV.get_template(TEMPLATE_FN)
 
-def render_readme(meta, env):
-    tmpl = env.get_template(TEMPLATE_FN)
+# one cache file per brick: "<key>\n<block>", overwritten when the key
+# changes.  key = sha256(meta.yaml bytes + salt), and the salt hashes
+# everything else the block depends on: template, this script, Jinja.
+CACHE_DIR = Path(__file__).resolve().parent / ".readme_cache" / Path(__file__).stem
+_CACHE_SALT = hashlib.sha256(
+    (TEMPLATE_DIR / TEMPLATE_FN).read_bytes()
+    + Path(__file__).read_bytes()
+    + jinja2.__version__.encode()
+).digest()
+
+def load_meta(meta_bytes):
+    return yaml.load(meta_bytes, Loader=_Loader)
+
+def render_readme(meta):
     first_src = meta["source"][0] if isinstance(meta.get("source"), list) else meta.get("source")
     context = {**meta, "src": first_src}
-    return tmpl.render(**context)
+    return _TEMPLATE.render(**context)
+
+def cache_key(meta_bytes):
+    return hashlib.sha256(meta_bytes + _CACHE_SALT).hexdigest()
+
+def rstrip_end(data, end):
+    """len(data[:end].decode().rstrip().encode()), without copying for ASCII."""
+    while end and data[end - 1] in _ASCII_WS:
+        end -= 1
+    if end and data[end - 1] >= 0x80:
+        end = len(data[:end].decode("utf-8").rstrip().encode("utf-8"))
+    return end
 
-def generate_for_brick(brick_name, env):
+def generate_for_brick(brick_name):
     brick_path = BRICKS_DIR / brick_name
     meta_path = brick_path / "meta.yaml"
 
@@ -25,23 +58,42 @@ def generate_for_brick(brick_name, env):
         print(f"⚠️  {brick_name}: meta.yaml not found – skipped")
         return
 
+    meta_bytes = meta_path.read_bytes()  # read once: cache key + YAML
+    key = cache_key(meta_bytes).encode()
+    cache_path = CACHE_DIR / f"{brick_name}.md"
     try:
-        meta = load_meta(meta_path)
-    except yaml.YAMLError as e:
-        print(f"❌  {brick_name}: meta.yaml invalid YAML – {e}")
-        return
-
-    generated_block = MARK + "\n" + render_readme(meta, env)
+        cached_key, _, block_b = cache_path.read_bytes().partition(b"\n")
+    except FileNotFoundError:
+        cached_key = None
+    if cached_key != key:
+        try:
+            meta = load_meta(meta_bytes)
+        except yaml.YAMLError as e:
+            print(f"❌  {brick_name}: meta.yaml invalid YAML – {e}")
+            return
+        block_b = MARK_B + b"\n" + render_readme(meta).encode("utf-8")
+        CACHE_DIR.mkdir(parents=True, exist_ok=True)
+        cache_path.write_bytes(key + b"\n" + block_b)
     readme_path = brick_path / "README.md"
 
     if readme_path.exists():
-        old = readme_path.read_text(encoding="utf-8")
-        manual = old.split(MARK, 1)[0].rstrip()
-        combined = manual + "\n\n" + generated_block
+        data = readme_path.read_bytes()
+        if b"\r" in data:                 # newline handling read_text() applied
+            data = data.replace(b"\r\n", b"\n").replace(b"\r", b"\n")
+        # manual part stays a view into `data`; no combined copy is built
+        cut = data.find(MARK_B)
+        end = rstrip_end(data, cut if cut >= 0 else len(data))
+        if (len(data) == end + 2 + len(block_b)
+                and data.endswith(block_b) and data[end:end + 2] == b"\n\n"):
+            print(f"⏭️  {brick_name}: README.md unchanged")
+            return
+        parts = (memoryview(data)[:end], b"\n\n", block_b)
     else:
-        combined = generated_block
+        parts = (block_b,)
 
-    readme_path.write_text(combined, encoding="utf-8")
+    with open(readme_path, "wb", buffering=WRITE_BUFSIZE) as fh:
+        for part in parts:
+            fh.write(part)
     print(f"✅  {brick_name}: README.md generated")
 
 def main():
@@ -51,14 +103,13 @@ def main():
     parser.add_argument("--brick", help="Generate README for specific brick")
     args = parser.parse_args()
 
-    env = Environment(loader=FileSystemLoader(TEMPLATE_DIR))
-
     if args.brick:
-        generate_for_brick(args.brick, env)
+        generate_for_brick(args.brick)
     else:
-        for brick in sorted(BRICKS_DIR.iterdir()):
-            if brick.is_dir():
-                generate_for_brick(brick.name, env)
+        with os.scandir(BRICKS_DIR) as it:
+            bricks = sorted(e.name for e in it if e.is_dir())
+        for name in bricks:
+            generate_for_brick(name)
 
 if __name__ == "__main__":
     main()
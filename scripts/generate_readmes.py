@@ -12,38 +12,72 @@ consistent marker.
   exist in an older marker.
 """
 
+import hashlib
+import json
+import os
 import re
+import jinja2
 import yaml
 from pathlib import Path
 from argparse import ArgumentParser
 from jinja2 import Environment, FileSystemLoader
+try:                                     # libyaml-backed; same safety level
+    from yaml import CSafeLoader as _Loader
+except ImportError:
+    from yaml import SafeLoader as _Loader
 
 # ────────────────────────────────────────────────────────────────
 MARK_CANON = "<!-- AUTO-GENERATED-README-START -->"
-# matches any of  U+002D -  U+2010 … U+2015
+# matches any of  U+002D -  U+2010 … U+2015, searched over raw README
+# bytes (U+2010 … U+2015 are E2 80 90 … E2 80 95 in UTF-8)
 MARK_RE = re.compile(
-    r"<!--\s*AUTO[\u002D\u2010-\u2015]GENERATED[\u002D\u2010-\u2015]"
-    r"README[\u002D\u2010-\u2015]START\s*-->",
+    rb"<!--\s*AUTO(?:-|\xe2\x80[\x90-\x95])GENERATED(?:-|\xe2\x80[\x90-\x95])"
+    rb"README(?:-|\xe2\x80[\x90-\x95])START\s*-->",
     flags=re.IGNORECASE,
 )
 
 BRICKS_DIR   = Path(__file__).resolve().parents[1] / "brick_repos"
 TEMPLATE_DIR = Path(__file__).resolve().parents[1] / "templates"
 TEMPLATE_FN  = "readme_template.j2"
+
+# Built once per process; every brick renders the same compiled template.
+_ENV = Environment(
+    loader=FileSystemLoader(TEMPLATE_DIR),
+    autoescape=True,
+    trim_blocks=True,
+    lstrip_blocks=True,
+)
+_TEMPLATE = _ENV.get_template(TEMPLATE_FN)
+
+# one cache file per brick: "<key>\n<block>", overwritten when the key
+# changes.  key = sha256(meta.yaml bytes + salt), and the salt hashes
+# everything else the block depends on: template, this script, Jinja.
+CACHE_DIR   = Path(__file__).resolve().parent / ".readme_cache" / Path(__file__).stem
+_CACHE_SALT = hashlib.sha256(
+    (TEMPLATE_DIR / TEMPLATE_FN).read_bytes()
+    + Path(__file__).read_bytes()
+    + jinja2.__version__.encode()
+).digest()
+
+# brick → sha1(auto block) as of the last run that left README.md canonical
+HASHES_PATH = BRICKS_DIR / ".readme_hashes.json"
+
+# README writes go through one 128 KiB buffered writer, manual part + block
+WRITE_BUFSIZE = 131072
+_ASCII_WS = frozenset(b" \t\n\r\x0b\x0c\x1c\x1d\x1e\x1f")   # str.isspace() ∩ ASCII
 # ────────────────────────────────────────────────────────────────
 
 
-def load_meta(meta_path: Path) -> dict:
-    with meta_path.open(encoding="utf-8") as fh:
-        return yaml.safe_load(fh)
+def load_meta(meta_bytes: bytes) -> dict:
+    # the bytes already read for the cache key; yaml sniffs the UTF-8/16 BOM
+    return yaml.load(meta_bytes, Loader=_Loader)
 
 
-def render_auto_section(meta: dict, env: Environment) -> str:
-    tmpl = env.get_template(TEMPLATE_FN)
+def render_auto_section(meta: dict) -> str:
     first_src = (
         meta["source"][0] if isinstance(meta.get("source"), list) else meta.get("source")
     )
-    md = tmpl.render(**meta, src=first_src)
+    md = _TEMPLATE.render(**meta, src=first_src)
 
     # Remove duplicate H1 (# chembl) if present ------------------
     lines = md.lstrip().splitlines()
@@ -56,7 +90,42 @@ def render_auto_section(meta: dict, env: Environment) -> str:
     return md
 
 
-def generate_for_brick(brick_name: str, env: Environment, *, force: bool = False) -> None:
+def cache_key(meta_bytes: bytes) -> str:
+    return hashlib.sha256(meta_bytes + _CACHE_SALT).hexdigest()
+
+
+def load_hashes() -> dict:
+    try:
+        return json.loads(HASHES_PATH.read_bytes())
+    except (FileNotFoundError, ValueError):
+        return {}
+
+
+def ends_with_block(path: Path, tail: bytes) -> bool:
+    """Tail-only read: does *path* end with *tail*, with no blank run before it?"""
+    with path.open("rb") as fh:
+        size = fh.seek(0, os.SEEK_END)
+        if size < len(tail):
+            return False
+        fh.seek(max(0, size - len(tail) - 1))
+        chunk = fh.read()
+    if not chunk.endswith(tail):
+        return False
+    return len(chunk) == len(tail) or not chunk[:1].isspace()
+
+
+def rstrip_end(data: bytes, end: int) -> int:
+    """len(data[:end].decode().rstrip().encode()), without copying for ASCII."""
+    while end and data[end - 1] in _ASCII_WS:
+        end -= 1
+    if end and data[end - 1] >= 0x80:     # could be NBSP, U+2003, …
+        end = len(data[:end].decode("utf-8").rstrip().encode("utf-8"))
+    return end
+
+
+def generate_for_brick(
+    brick_name: str, *, force: bool = False, hashes: dict | None = None
+) -> None:
     brick_path  = BRICKS_DIR / brick_name
     meta_path   = brick_path / "meta.yaml"
     readme_path = brick_path / "README.md"
@@ -65,33 +134,67 @@ def generate_for_brick(brick_name: str, env: Environment, *, force: bool = False
         print(f"⚠️  {brick_name}: meta.yaml not found – skipped")
         return
 
-    try:
-        meta = load_meta(meta_path)
-    except yaml.YAMLError as exc:
-        print(f"❌  {brick_name}: invalid YAML – {exc}")
+    readme_exists = readme_path.exists()
+    if not readme_exists and not force:
+        # nothing will be written → don't parse meta or render at all
+        print(
+            f"📝  {brick_name}: no README.md found — run with --force to create one"
+        )
         return
 
-    auto_md = render_auto_section(meta, env)
-    autogenerated_block = f"{MARK_CANON}\n{auto_md}"
-
-    if readme_path.exists():
-        original = readme_path.read_text(encoding="utf-8")
-        match = MARK_RE.search(original)
-        manual_section = original[: match.start()] if match else original
-        manual_section = manual_section.rstrip()
-
-        new_readme = f"{manual_section}\n\n{autogenerated_block}"
-        readme_path.write_text(new_readme, encoding="utf-8")
+    # rendered at most once per brick (and not at all on a cache hit);
+    # meta.yaml is read once and the block stays bytes from cache to README
+    meta_bytes = meta_path.read_bytes()
+    key = cache_key(meta_bytes).encode()
+    cache_path = CACHE_DIR / f"{brick_name}.md"
+    try:
+        cached_key, _, block_b = cache_path.read_bytes().partition(b"\n")
+    except FileNotFoundError:
+        cached_key = None
+    if cached_key != key:
+        try:
+            meta = load_meta(meta_bytes)
+        except yaml.YAMLError as exc:
+            print(f"❌  {brick_name}: invalid YAML – {exc}")
+            return
+        auto_md = render_auto_section(meta)
+        block_b = f"{MARK_CANON}\n{auto_md}".encode("utf-8")
+        CACHE_DIR.mkdir(parents=True, exist_ok=True)
+        cache_path.write_bytes(key + b"\n" + block_b)
+
+    tail = b"\n\n" + block_b
+    block_hash = hashlib.sha1(block_b).hexdigest()
+    prev_hash = None
+    if hashes is not None:
+        prev_hash = hashes.get(brick_name)
+        hashes[brick_name] = block_hash   # every path below leaves it canonical
+
+    if readme_exists:
+        # same block as last run and still at the end of the file → done,
+        # without reading the (possibly large) manual section at all
+        if prev_hash == block_hash and ends_with_block(readme_path, tail):
+            print(f"⏭️  {brick_name}: README.md unchanged")
+            return
+        data = readme_path.read_bytes()
+        if b"\r" in data:                 # newline handling read_text() applied
+            data = data.replace(b"\r\n", b"\n").replace(b"\r", b"\n")
+        # manual section = everything before the first marker, rstripped;
+        # kept as a zero-copy view into `data`, never re-joined in memory
+        match = MARK_RE.search(data)
+        end = rstrip_end(data, match.start() if match else len(data))
+
+        if len(data) == end + len(tail) and data.endswith(tail):
+            print(f"⏭️  {brick_name}: README.md unchanged")
+            return
+        with open(readme_path, "wb", buffering=WRITE_BUFSIZE) as fh:
+            fh.write(memoryview(data)[:end])
+            fh.write(tail)
         print(f"✅  {brick_name}: README.md updated (auto block replaced)")
-    elif force:
-        header = f"# {brick_name}\n"
-        new_readme = f"{header}\n\n{autogenerated_block}"
-        readme_path.write_text(new_readme, encoding="utf-8")
-        print(f"🆕  {brick_name}: README.md created")
     else:
-        print(
-            f"📝  {brick_name}: no README.md found — run with --force to create one"
-        )
+        with open(readme_path, "wb", buffering=WRITE_BUFSIZE) as fh:
+            fh.write(f"# {brick_name}\n".encode("utf-8"))
+            fh.write(tail)
+        print(f"🆕  {brick_name}: README.md created")
 
 
 def main() -> None:
@@ -104,19 +207,20 @@ def main() -> None:
     )
     args = parser.parse_args()
 
-    env = Environment(
-        loader=FileSystemLoader(TEMPLATE_DIR),
-        autoescape=True,
-        trim_blocks=True,
-        lstrip_blocks=True,
-    )
+    hashes = load_hashes()
+    before = dict(hashes)
 
     if args.brick:
-        generate_for_brick(args.brick, env, force=args.force)
+        generate_for_brick(args.brick, force=args.force, hashes=hashes)
     else:
-        for brick_dir in sorted(BRICKS_DIR.iterdir()):
-            if brick_dir.is_dir():
-                generate_for_brick(brick_dir.name, env, force=args.force)
+        # DirEntry.is_dir() uses the d_type from readdir – no stat per entry
+        with os.scandir(BRICKS_DIR) as it:
+            bricks = sorted(e.name for e in it if e.is_dir())
+        for name in bricks:
+            generate_for_brick(name, force=args.force, hashes=hashes)
+
+    if hashes != before:                  # one write for the whole run
+        HASHES_PATH.write_text(json.dumps(hashes, indent=1, sort_keys=True))
 
 
 if __name__ == "__main__":
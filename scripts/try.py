@@ -1,14 +1,19 @@
+"""
+Quick smoke test: load the CoMPAIT parquet asset and print the first rows.
 
-import biobricks as bb
-import pandas as pd
+CoMPAIT = Collaborative Modeling Project for Acute Inhalation Toxicity.
+"""
 
-paths = bb.assets("compait")
-df = pd.read_parquet(paths.compait_parquet)
-print(df.head())
 
-## Additional Information
+def main():
+    # imported here so importing this module never pulls in pandas/biobricks
+    import biobricks as bb
+    import pandas as pd
 
-Collaborative Modeling Project for Acute Inhalation Toxicity (CoMPAIT)
+    paths = bb.assets("compait")
+    df = pd.read_parquet(paths.compait_parquet)
+    print(df.head())
 
 
-![alt text](image.png)
\ No newline at end of file
+if __name__ == "__main__":
+    main()
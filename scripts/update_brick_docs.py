@@ -12,6 +12,7 @@ $ python scripts/update_brick_docs.py \
 
 Requires: requests, pyyaml, jinja2
 pip install requests pyyaml jinja2
+optional: pip install pygit2   # in-process add/commit instead of `git`
 """
 
 
@@ -22,12 +23,24 @@ Auto‑generate meta.yaml + README.md for every *dataset* repo in biobricks‑ai
 (…docstring continues…)
 """
 
-import argparse, json, os, re, subprocess, sys, textwrap, time
+import argparse, functools, json, os, re, subprocess, sys, time
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from pathlib import Path
 from typing import List, Dict, Any
+from urllib.parse import parse_qs, urlsplit
 
 import requests, yaml
 from jinja2 import Environment, FileSystemLoader, select_autoescape
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+try:                                     # C-backed JSON; parses bytes directly
+    import orjson
+except ImportError:
+    orjson = None
+try:                                     # libgit2: add/commit without fork+exec
+    import pygit2
+except ImportError:
+    pygit2 = None
 
 STATUS_API = "https://status.biobricks.ai/api/v0"
 GITHUB_API = "https://api.github.com"
@@ -37,18 +50,107 @@ TEMPLATE_DIR = THIS_DIR / "templates"
 TEMPLATE_DIR.mkdir(exist_ok=True)
 TEMPLATE_FILE = TEMPLATE_DIR / "readme_template.j2"
 
+# One pooled session for status.biobricks.ai + api.github.com, shared by
+# all worker threads (pool sized to match --workers).
+SESSION = requests.Session()
+SESSION.headers.update({"Accept": "application/json"})
+SESSION.mount("https://", HTTPAdapter(
+    pool_connections=32, pool_maxsize=32,
+    max_retries=Retry(total=3, backoff_factor=0.2),
+))
+
+# Fallback README template, written to TEMPLATE_FILE if it is missing.
+# Kept flush-left so it can be written verbatim (no dedent pass).
+_DEFAULT_TEMPLATE = """\
+# {{ brick_name }}
+
+## 🔍 Overview
+{{ description }}
+
+## 📦 Data Source
+- **{{ source.name }}**  
+  URL: {{ source.url }}  
+  {% if source.citation %}Citation: {{ source.citation }}{% endif %}{% if source.license %}<br>License: {{ source.license }}{% endif %}
+
+## 🔄 Transformations
+{{ transformations }}
+
+## 📁 Assets
+{% for a in assets -%}
+- `{{ a.file }}` ({{ a.format }}): {{ a.description }}
+{%- endfor %}
+
+## 🧪 Usage
+```bash
+biobricks install {{ brick_name }}
+```
+
+```python
+import biobricks as bb
+import pandas as pd
+
+paths = bb.assets("{{ brick_name }}")
+{% for a in assets if a.format in ["PARQUET","CSV","TSV","JSON"] -%}
+df_{{ loop.index }} = pd.read_{{ "parquet" if a.format=="PARQUET" else "csv" }}(
+    paths.{{ a.file.replace('.','_').replace('-','_') }}
+)
+{%- endfor %}
+print(df_1.head())
+```"""
+
+
+def _load_json(r: requests.Response) -> Any:
+    """Decode a response body from raw bytes (orjson if available)."""
+    if orjson is not None:
+        return orjson.loads(r.content)
+    return json.loads(r.content)
+
+
 # ------------------------------------------------------------------------
 # 0.  Discover brick list
 # ------------------------------------------------------------------------
+def _fetch_brick_page(owner: str, page: int) -> requests.Response:
+    url = f"{STATUS_API}/owner/{owner}/brick?page={page}&per_page=100"
+    return SESSION.get(url, timeout=30)
+
+
+def _last_page(r: requests.Response) -> int | None:
+    """Page number from a `Link: <…&page=N…>; rel="last"` header, if any."""
+    last = r.links.get("last", {}).get("url")
+    if not last:
+        return None
+    try:
+        return int(parse_qs(urlsplit(last).query)["page"][0])
+    except (KeyError, ValueError):
+        return None
+
+
 def discover_bricks(owner: str) -> List[str]:
-    bricks = []
-    page = 1
+    r = _fetch_brick_page(owner, 1)
+    if r.status_code != 200:
+        return []
+    data = _load_json(r)
+    if not data:
+        return []
+    bricks = [b["name"] for b in data]
+
+    last = _last_page(r)
+    if last is not None:
+        # page count known up front → fetch 2..last concurrently
+        with ThreadPoolExecutor(max_workers=min(8, max(1, last - 1))) as pool:
+            for r in pool.map(lambda p: _fetch_brick_page(owner, p),
+                              range(2, last + 1)):
+                if r.status_code == 200:
+                    bricks += [b["name"] for b in _load_json(r) or []]
+        return sorted(bricks)
+
+    # no Link header → walk pages until an empty / non-200 response
+    page = 2
     while True:
-        url = f"{STATUS_API}/owner/{owner}/brick?page={page}&per_page=100"
-        r = requests.get(url, timeout=30)
+        r = _fetch_brick_page(owner, page)
         if r.status_code != 200:
             break
-        data = r.json()
+        data = _load_json(r)
         if not data:
             break
         bricks += [b["name"] for b in data]
@@ -61,72 +163,60 @@ def discover_bricks(owner: str) -> List[str]:
 # ------------------------------------------------------------------------
 def fetch_status(owner: str, brick: str) -> Dict[str, Any] | None:
     url = f"{STATUS_API}/owner/{owner}/brick/{brick}"
-    r = requests.get(url, timeout=30)
+    r = SESSION.get(url, timeout=30)
     if r.status_code != 200:
         return None
-    return r.json()
+    return _load_json(r)
 
 
 # ------------------------------------------------------------------------
 # 2.  Cross‑check GitHub (fallback for description / homepage)
 # ------------------------------------------------------------------------
+# "org/repo" → {"etag": …, "repo": {description, homepage}}; persisted in
+# <workdir>/.gh_etags.json so repeat runs get cheap 304 Not Modified replies
+GH_ETAGS_FILE = ".gh_etags.json"
+_GH_ETAGS: Dict[str, Dict[str, Any]] = {}
+
+
 def fetch_gh_repo(org: str, repo: str, token: str) -> Dict[str, Any]:
+    # token goes on GitHub requests only, never to status.biobricks.ai
     headers = {"Authorization": f"Bearer {token}"} if token else {}
-    HEADERS = {"Accept": "application/json"}
-    r = requests.get(f"{GITHUB_API}/repos/{org}/{repo}", headers=HEADERS, timeout=30)
+    key = f"{org}/{repo}"
+    cached = _GH_ETAGS.get(key)
+    if cached:
+        headers["If-None-Match"] = cached["etag"]
+    r = SESSION.get(f"{GITHUB_API}/repos/{org}/{repo}", headers=headers, timeout=30)
+    if r.status_code == 304 and cached:
+        return cached["repo"]
     r.raise_for_status()
-    return r.json()
+    data = _load_json(r)
+    if r.headers.get("ETag"):
+        # only the fields build_meta falls back to are worth keeping
+        _GH_ETAGS[key] = {
+            "etag": r.headers["ETag"],
+            "repo": {k: data.get(k) for k in ("description", "homepage")},
+        }
+    return data
+
+
+def load_gh_etags(workdir: Path) -> None:
+    try:
+        _GH_ETAGS.update(json.loads((workdir / GH_ETAGS_FILE).read_bytes()))
+    except (FileNotFoundError, ValueError):
+        pass
 
 
 # ------------------------------------------------------------------------
 # Helpers
 # ------------------------------------------------------------------------
+_SLUG_RE = re.compile(r"[^0-9A-Za-z_\-]")
+
 def slugify(s: str) -> str:
-    return re.sub(r"[^0-9A-Za-z_\-]", "_", s)
+    return _SLUG_RE.sub("_", s)
 
 def ensure_template():
-    if TEMPLATE_FILE.exists():
-        return
-    TEMPLATE_FILE.write_text(
-        textwrap.dedent(
-            """\
-            # {{ brick_name }}
-
-            ## 🔍 Overview
-            {{ description }}
-
-            ## 📦 Data Source
-            - **{{ source.name }}**  
-              URL: {{ source.url }}  
-              {% if source.citation %}Citation: {{ source.citation }}{% endif %}{% if source.license %}<br>License: {{ source.license }}{% endif %}
-
-            ## 🔄 Transformations
-            {{ transformations }}
-
-            ## 📁 Assets
-            {% for a in assets -%}
-            - `{{ a.file }}` ({{ a.format }}): {{ a.description }}
-            {%- endfor %}
-
-            ## 🧪 Usage
-            ```bash
-            biobricks install {{ brick_name }}
-            ```
-
-            ```python
-            import biobricks as bb
-            import pandas as pd
-
-            paths = bb.assets("{{ brick_name }}")
-            {% for a in assets if a.format in ["PARQUET","CSV","TSV","JSON"] -%}
-            df_{{ loop.index }} = pd.read_{{ "parquet" if a.format=="PARQUET" else "csv" }}(
-                paths.{{ a.file.replace('.','_').replace('-','_') }}
-            )
-            {%- endfor %}
-            print(df_1.head())
-            ```"""
-        )
-    )
+    if not TEMPLATE_FILE.exists():
+        TEMPLATE_FILE.write_text(_DEFAULT_TEMPLATE)
 
 
 # ------------------------------------------------------------------------
@@ -165,62 +255,167 @@ def build_meta(brick: str, status: Dict[str, Any], gh_meta: Dict[str, Any]) -> D
 # ------------------------------------------------------------------------
 # 4.  Render README
 # ------------------------------------------------------------------------
-def render_readme(meta: Dict[str, Any]) -> str:
+@functools.cache
+def _get_template():
+    """Environment + compiled template, built once (after ensure_template)."""
+    ensure_template()
     env = Environment(
         loader=FileSystemLoader(str(TEMPLATE_DIR)),
         autoescape=select_autoescape()
     )
-    tmpl = env.get_template("readme_template.j2")
-    return tmpl.render(**meta, source=meta["source"][0])
+    return env.get_template("readme_template.j2")
+
+
+def render_readme(meta: Dict[str, Any]) -> str:
+    return _get_template().render(**meta, source=meta["source"][0])
 
 
 # ------------------------------------------------------------------------
 # Git helpers
 # ------------------------------------------------------------------------
+# never block a worker on a credential prompt — fail fast instead
+GIT_ENV = {**os.environ, "GIT_TERMINAL_PROMPT": "0"}
+
+
 def run(cmd, cwd=None, check=True, quiet=False):
     kwargs = {}
     if quiet:
         kwargs["stdout"] = subprocess.DEVNULL
         kwargs["stderr"] = subprocess.DEVNULL
-    subprocess.run(cmd, cwd=cwd, check=check, **kwargs)
+    subprocess.run(cmd, cwd=cwd, check=check, env=GIT_ENV, **kwargs)
 
 
 def clone_or_pull(org: str, repo: str, dest: Path):
+    # only the tip is needed to rewrite two files: no history, no old blobs
     if dest.exists():
-        run(["git", "pull", "--quiet"], cwd=dest)
+        run(["git", "fetch", "--quiet", "--depth=1", "origin", "HEAD"], cwd=dest)
+        run(["git", "reset", "--quiet", "--hard", "FETCH_HEAD"], cwd=dest)
     else:
-        run(["git", "clone", f"https://github.com/{org}/{repo}.git", str(dest)], quiet=True)
+        run(["git", "clone", "--depth=1", "--filter=blob:none", "--single-branch",
+             f"https://github.com/{org}/{repo}.git", str(dest)], quiet=True)
+
+
+# add + commit + push in a single process; $1=name $2=email $3=message
+_PUBLISH_SH = (
+    'git add -A -- meta.yaml README.md'
+    ' && git -c user.name="$1" -c user.email="$2" commit -q -m "$3"'
+    ' && git push -q'
+)
+_COMMIT_MSG = "docs: auto‑generate README/meta"
+
+
+def _commit_in_process(repo_path: Path, name: str, email: str) -> bool:
+    """Stage + commit the two doc files via libgit2; False if nothing changed."""
+    repo = pygit2.Repository(str(repo_path))
+    index = repo.index
+    index.add("meta.yaml")
+    index.add("README.md")
+    index.write()
+    tree = index.write_tree()
+    parent = repo.head.peel(pygit2.Commit)
+    if tree == parent.tree_id:
+        return False
+    sig = pygit2.Signature(name, email)
+    repo.create_commit("HEAD", sig, sig, _COMMIT_MSG, tree, [parent.id])
+    return True
 
 
 def commit_and_push(repo_path: Path, author: str):
-    run(["git", "add", "meta.yaml", "README.md"], cwd=repo_path)
-    # If nothing to commit, skip
+    """Only called when meta.yaml / README.md actually changed on disk."""
+    name, email = author.split()[0], author.split()[-1].strip("<>")
+    if pygit2 is not None:
+        try:
+            committed = _commit_in_process(repo_path, name, email)
+        except pygit2.GitError:
+            committed = None          # e.g. libgit2 too old for shallow repos
+        if committed is not None:
+            # push stays on the CLI so the user's credential helpers apply
+            if not committed:
+                return False
+            res = subprocess.run(
+                ["git", "push", "-q"], cwd=repo_path, env=GIT_ENV,
+                stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+            )
+            return res.returncode == 0
     res = subprocess.run(
-        ["git", "diff", "--cached", "--quiet"], cwd=repo_path
+        ["sh", "-c", _PUBLISH_SH, "sh", name, email, _COMMIT_MSG],
+        cwd=repo_path, env=GIT_ENV,
+        stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
     )
-    if res.returncode == 0:  # no changes
-        return False
-    run(["git", "-c", f"user.name={author.split()[0]}", "-c", f"user.email={author.split()[-1].strip('<>')}",
-         "commit", "-m", "docs: auto‑generate README/meta"], cwd=repo_path)
+    return res.returncode == 0  # non-zero: push denied (user can fork manually)
+
+
+def write_if_changed(path: Path, data: bytes) -> bool:
+    """One write() of the fully-rendered bytes, skipped if already on disk."""
     try:
-        run(["git", "push"], cwd=repo_path, quiet=True)
-        return True
-    except subprocess.CalledProcessError:
-        return False  # permissions error; user can fork manually
+        if path.read_bytes() == data:
+            return False          # keep mtime; git sees nothing new
+    except FileNotFoundError:
+        pass
+    path.write_bytes(data)
+    return True
 
 
 # ------------------------------------------------------------------------
+def process(b: str, args, workdir: Path) -> str:
+    """Handle one brick; returns the summary bucket it falls into."""
+    print(f"→ {b}")
+    status_json = fetch_status(args.org, b)
+    if not status_json:
+        print(f"   {b}: no status record")
+        return "no_status"
+
+    # simple heuristic to skip non‑dataset repos
+    if status_json.get("type") == "tool":
+        print(f"   {b}: skipped (tool/template)")
+        return "skipped"
+
+    repo_path = workdir / b
+    clone_or_pull(args.org, b, repo_path)
+
+    # GitHub is only a fallback for these two fields – skip the round-trip
+    # when the status record already has both
+    if status_json.get("description") and status_json.get("homepage"):
+        gh_meta = {}
+    else:
+        gh_meta = fetch_gh_repo(args.org, b, args.token)
+    meta = build_meta(b, status_json, gh_meta)
+
+    # serialise fully in memory (YAML emitter → one buffer), then write
+    # each file only if its bytes differ from what is already there
+    meta_b = yaml.safe_dump(meta, sort_keys=False).encode("utf-8")
+    readme_b = render_readme(meta).encode("utf-8")
+    changed = [write_if_changed(repo_path / "meta.yaml", meta_b),
+               write_if_changed(repo_path / "README.md", readme_b)]
+
+    # identical to what is on disk → nothing to commit, don't touch git
+    if not any(changed):
+        print(f"   ⏭️  {b}: unchanged")
+        return "skipped"
+
+    # commit & push
+    if commit_and_push(repo_path, args.author):
+        print(f"   ✅  {b}: pushed")
+        return "pushed"
+    print(f"   🟡  {b}: commit or push failed")
+    return "failed"
+
+
 def main():
     parser = argparse.ArgumentParser()
     parser.add_argument("--org", default="biobricks-ai")
     parser.add_argument("--author", default="doc‑bot <docs@biobricks.ai>")
     parser.add_argument("--token", default=os.getenv("GH_TOKEN", ""))
     parser.add_argument("--workdir", default="brick_repos")
+    parser.add_argument("--workers", type=int, default=16,
+                        help="bricks processed in parallel (I/O bound)")
     args = parser.parse_args()
 
-    ensure_template()
+    _get_template()              # compile once, before the worker threads start
     workdir = Path(args.workdir)
     workdir.mkdir(exist_ok=True)
+    load_gh_etags(workdir)
+    etags_before = dict(_GH_ETAGS)
 
     bricks = discover_bricks(args.org)
     print(f"Discovered {len(bricks)} bricks")
@@ -228,41 +423,19 @@ def main():
     start = time.time()
     summary = {"pushed": 0, "skipped": 0, "no_status": 0, "failed": 0}
 
-    for b in bricks:
-        print(f"→ {b}")
-        status_json = fetch_status(args.org, b)
-        if not status_json:
-            print("   no status record")
-            summary["no_status"] += 1
-            continue
-
-        # simple heuristic to skip non‑dataset repos
-        if status_json.get("type") == "tool":
-            print("   skipped (tool/template)")
-            summary["skipped"] += 1
-            continue
-
-        repo_path = workdir / b
-        clone_or_pull(args.org, b, repo_path)
-
-        gh_meta = fetch_gh_repo(args.org, b, args.token)
-        meta = build_meta(b, status_json, gh_meta)
-
-        # write meta.yaml
-        with open(repo_path / "meta.yaml", "w") as f:
-            yaml.safe_dump(meta, f, sort_keys=False)
-
-        # render README
-        (repo_path / "README.md").write_text(render_readme(meta))
-
-        # commit & push
-        ok = commit_and_push(repo_path, args.author)
-        if ok:
-            summary["pushed"] += 1
-            print("   ✅  pushed")
-        else:
-            summary["failed"] += 1
-            print("   🟡  push denied or nothing to commit")
+    # every step is network/subprocess bound and each brick has its own
+    # repo_path, so bricks can run side by side; results are tallied here
+    with ThreadPoolExecutor(max_workers=args.workers) as ex:
+        futures = {ex.submit(process, b, args, workdir): b for b in bricks}
+        for fut in as_completed(futures):
+            try:
+                summary[fut.result()] += 1
+            except Exception as e:
+                print(f"   ❌  {futures[fut]}: {e}")
+                summary["failed"] += 1
+
+    if _GH_ETAGS != etags_before:         # one write for the whole run
+        (workdir / GH_ETAGS_FILE).write_text(json.dumps(_GH_ETAGS, indent=1, sort_keys=True))
 
     elapsed = int(time.time() - start) // 60
     print("\n=== SUMMARY ===")
@@ -0,0 +1,95 @@
+import ast
+import re
+from pathlib import Path
+from types import SimpleNamespace
+
+import pytest
+import yaml
+
+SCRIPT = Path(__file__).resolve().parents[1] / "scripts" / "Enrich_Meta_Gpt.py"
+
+
+def _defined_name(node):
+    if isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef, ast.ClassDef)):
+        return node.name
+    if isinstance(node, ast.Assign) and isinstance(node.targets[0], ast.Name):
+        return node.targets[0].id
+    if isinstance(node, ast.AnnAssign) and isinstance(node.target, ast.Name):
+        return node.target.id
+    return None
+
+
+def load_defs(*names, **env):
+    """
+    Execute only the named top-level definitions of the script, so these
+    tests don't need its network/GPT dependencies (aiohttp, openai, …).
+    """
+    tree = ast.parse(SCRIPT.read_text(encoding="utf-8"))
+    nodes = [n for n in tree.body if _defined_name(n) in names]
+    assert {_defined_name(n) for n in nodes} == set(names)
+    ns = dict(re=re, yaml=yaml, Path=Path,
+              _Loader=getattr(yaml, "CSafeLoader", yaml.SafeLoader),
+              _Dumper=getattr(yaml, "CSafeDumper", yaml.SafeDumper), **env)
+    exec(compile(ast.Module(nodes, type_ignores=[]), str(SCRIPT), "exec"), ns)
+    return SimpleNamespace(**ns)
+
+
+emg = load_defs("META_TEMPLATE", "TOP_KEY_RX", "DOC_END", "complete_prefix")
+
+ANSWER = (
+    "title: T\n"
+    "description: D\n"
+    "source:\n- S\n"
+    "license: MIT\n"
+    "tags:\n- a\n"
+    "assets:\n- file: x.parquet\n  format: Parquet\n  description: d\n"
+    "transformations: Raw data converted to parquet,\n"
+    "  with deduplication and unit normalisation.\n"
+)
+
+
+def first_stop(text):
+    """Feed *text* line by line, as gpt_stream does; return the first prefix."""
+    buf = ""
+    for line in text.splitlines(keepends=True):
+        buf += line
+        if (prefix := emg.complete_prefix(buf)) is not None:
+            return prefix
+    return None
+
+
+def test_complete_prefix_waits_for_continuation_lines():
+    assert first_stop(ANSWER) is None
+
+
+def test_complete_prefix_stops_at_next_top_level_key():
+    prefix = emg.complete_prefix(ANSWER + "notes: extra\n")
+    assert prefix is not None
+    assert yaml.safe_load(prefix)["transformations"] == (
+        "Raw data converted to parquet, with deduplication and unit normalisation."
+    )
+
+
+@pytest.mark.parametrize("trailer", ["...\n", "...\n```\n", "...\nHope this helps!\n"])
+def test_complete_prefix_stops_at_document_end_marker(trailer):
+    # a well-formed 7-key answer must be enough to stop the stream
+    assert first_stop(ANSWER + trailer) == ANSWER.rstrip("\n")
+
+
+def test_complete_prefix_needs_every_key_before_the_end_marker():
+    partial = ANSWER.split("transformations:")[0]
+    assert first_stop(partial + "...\n") is None
+
+
+def test_semantic_cache_never_shares_dataset_specific_keys(tmp_path):
+    np = pytest.importorskip("numpy")
+    sc = load_defs("SEMANTIC_THRESHOLD", "SEMANTIC_KEYS", "SemanticCache", np=np)
+
+    cache = sc.SemanticCache(tmp_path / "semantic.npz")
+    vec = np.array([1.0, 0.0], dtype=np.float32)
+    cache.add(vec, yaml.safe_load(ANSWER))
+    assert cache.lookup(vec) == {
+        "transformations": (
+            "Raw data converted to parquet, with deduplication and unit normalisation."
+        ),
+    }
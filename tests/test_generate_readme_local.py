@@ -0,0 +1,77 @@
+import importlib
+import sys
+from pathlib import Path
+
+import pytest
+import yaml
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "scripts"))
+grl = importlib.import_module("generate_readme_local")
+
+META = (
+    "brick_name: demo\n"
+    "title: Demo\n"
+    "description: desc ünïcode\n"
+    "source:\n- name: S\n  url: http://x\n"
+    "transformations: none\n"
+    "assets:\n- file: x.parquet\n  format: PARQUET\n  description: d\n"
+)
+
+
+@pytest.fixture
+def brick(tmp_path, monkeypatch):
+    monkeypatch.setattr(grl, "BRICKS_DIR", tmp_path / "brick_repos")
+    monkeypatch.setattr(grl, "CACHE_DIR", tmp_path / "cache")
+    d = tmp_path / "brick_repos" / "demo"
+    d.mkdir(parents=True)
+    (d / "meta.yaml").write_text(META, encoding="utf-8")
+    return d
+
+
+def block():
+    return grl.MARK_B + b"\n" + grl.render_readme(yaml.safe_load(META)).encode("utf-8")
+
+
+@pytest.mark.parametrize("readme, manual", [
+    (b"# A\n\ntext\n", b"# A\n\ntext"),
+    (b"# A\r\n\r\ntext\r\n", b"# A\n\ntext"),                       # CRLF
+    ("# A\n\ntext\u00a0\u2003 \n".encode(), b"# A\n\ntext"),          # Unicode spaces
+    ("# A\n\ncafé \n".encode(), "# A\n\ncafé".encode()),              # non-space non-ASCII
+    (b"# A\n\n" + grl.MARK_B + b"\nold\n" + grl.MARK_B + b"\nnewer\n", b"# A"),
+    # only the exact (U+2011) marker counts here; an ASCII one is manual text
+    (b"# A\n<!-- AUTO-GENERATED-README-START -->\nold\n",
+     b"# A\n<!-- AUTO-GENERATED-README-START -->\nold"),
+    (b"", b""),
+    (b" \n\n", b""),
+])
+def test_manual_section_is_kept_and_block_replaced(brick, readme, manual):
+    (brick / "README.md").write_bytes(readme)
+    grl.generate_for_brick("demo")
+    assert (brick / "README.md").read_bytes() == manual + b"\n\n" + block()
+
+
+def test_missing_readme_gets_block_only(brick):
+    grl.generate_for_brick("demo")
+    assert (brick / "README.md").read_bytes() == block()
+
+
+def test_up_to_date_readme_is_not_rewritten(brick, capsys):
+    readme = brick / "README.md"
+    readme.write_bytes(b"# A\n\ntext\n")
+    grl.generate_for_brick("demo")
+    expected = readme.read_bytes()
+    mtime = readme.stat().st_mtime_ns
+    capsys.readouterr()
+
+    grl.generate_for_brick("demo")
+    assert "unchanged" in capsys.readouterr().out
+    assert readme.read_bytes() == expected
+    assert readme.stat().st_mtime_ns == mtime
+
+
+@pytest.mark.parametrize("text", [
+    "", " ", "abc  \n\t", "abc\u00a0", "abc\u3000 \u2003", "é \n", "x\x1c\x1f", "x\x85",
+])
+def test_rstrip_end_matches_str_rstrip(text):
+    data = text.encode("utf-8")
+    assert grl.rstrip_end(data, len(data)) == len(text.rstrip().encode("utf-8"))
@@ -0,0 +1,98 @@
+import importlib
+import sys
+from pathlib import Path
+
+import pytest
+import yaml
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "scripts"))
+gr = importlib.import_module("generate_readmes")
+
+META = (
+    "brick_name: demo\n"
+    "title: Demo\n"
+    "description: desc ünïcode\n"
+    "source:\n- name: S\n  url: http://x\n"
+    "transformations: none\n"
+    "assets:\n- file: x.parquet\n  format: PARQUET\n  description: d\n"
+)
+
+
+@pytest.fixture
+def brick(tmp_path, monkeypatch):
+    monkeypatch.setattr(gr, "BRICKS_DIR", tmp_path / "brick_repos")
+    monkeypatch.setattr(gr, "CACHE_DIR", tmp_path / "cache")
+    monkeypatch.setattr(gr, "HASHES_PATH", tmp_path / "brick_repos" / ".readme_hashes.json")
+    d = tmp_path / "brick_repos" / "demo"
+    d.mkdir(parents=True)
+    (d / "meta.yaml").write_text(META, encoding="utf-8")
+    return d
+
+
+def block():
+    meta = yaml.safe_load(META)
+    return f"{gr.MARK_CANON}\n{gr.render_auto_section(meta)}".encode("utf-8")
+
+
+@pytest.mark.parametrize("readme, manual", [
+    (b"# A\n\ntext\n", b"# A\n\ntext"),
+    (b"# A\r\n\r\ntext\r\n", b"# A\n\ntext"),                       # CRLF
+    (b"# A\rtext\r", b"# A\ntext"),                                   # lone CR
+    ("# A\n\ntext\u00a0\u2003 \n".encode(), b"# A\n\ntext"),          # Unicode spaces
+    ("# A\n\ntext\x1c\x1f\x0b\n".encode(), b"# A\n\ntext"),           # ASCII isspace()
+    ("# A\n\ncafé \n".encode(), "# A\n\ncafé".encode()),              # non-space non-ASCII
+    ("# A\n\n<!-- AUTO\u2010GENERATED-README-START -->\nold\n"
+     "<!-- AUTO-GENERATED-README-START -->\nnewer\n".encode(), b"# A"),  # two markers
+    ("# A\n<!--auto\u2014generated\u2014readme\u2014start-->\nold".encode(), b"# A"),
+    (b"", b""),
+    (b" \n\n", b""),
+])
+def test_manual_section_is_kept_and_block_replaced(brick, readme, manual):
+    (brick / "README.md").write_bytes(readme)
+    gr.generate_for_brick("demo")
+    assert (brick / "README.md").read_bytes() == manual + b"\n\n" + block()
+
+
+def test_missing_readme_is_created_with_force(brick):
+    gr.generate_for_brick("demo", force=True)
+    assert (brick / "README.md").read_bytes() == b"# demo\n" + b"\n\n" + block()
+
+
+def test_missing_readme_is_left_alone_without_force(brick):
+    gr.generate_for_brick("demo")
+    assert not (brick / "README.md").exists()
+
+
+@pytest.mark.parametrize("hashes", [None, {}])
+def test_up_to_date_readme_is_not_rewritten(brick, capsys, hashes):
+    readme = brick / "README.md"
+    readme.write_bytes(b"# A\n\ntext\n")
+    gr.generate_for_brick("demo", hashes=hashes)
+    expected = readme.read_bytes()
+    mtime = readme.stat().st_mtime_ns
+    capsys.readouterr()
+
+    gr.generate_for_brick("demo", hashes=hashes)
+    assert "unchanged" in capsys.readouterr().out
+    assert readme.read_bytes() == expected
+    assert readme.stat().st_mtime_ns == mtime
+
+
+def test_hash_fast_path_still_rewrites_a_non_canonical_readme(brick):
+    hashes = {}
+    readme = brick / "README.md"
+    readme.write_bytes(b"# A\n")
+    gr.generate_for_brick("demo", hashes=hashes)
+    # same block, but blank lines crept in before it since the last run
+    readme.write_bytes(b"# A\n \n\n\n" + block())
+    gr.generate_for_brick("demo", hashes=hashes)
+    assert readme.read_bytes() == b"# A\n\n" + block()
+
+
+@pytest.mark.parametrize("text", [
+    "", " ", "abc", "abc  \n\t", "abc\u00a0", "abc\u3000 \u2003", "é", "é \n",
+    "\u00a0", "x\x1c\x1d\x1e\x1f", "x\x85", "日本語\u2029\n",
+])
+def test_rstrip_end_matches_str_rstrip(text):
+    data = text.encode("utf-8")
+    assert gr.rstrip_end(data, len(data)) == len(text.rstrip().encode("utf-8"))